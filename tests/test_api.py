@@ -1,47 +1,78 @@
 """
 Tests for the Mergington High School Activities API
 """
+from collections import namedtuple
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
-from src.app import app, activities
+from src.app import (
+    app,
+    activities,
+    signup_for_activity,
+    unregister_from_activity,
+)
 
+# URL-encoded activity names for building request paths
+TENNIS = "Tennis%20Club"
+BASKETBALL = "Basketball%20Team"
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the FastAPI app"""
+    """Create a single test client for the FastAPI app, shared across tests"""
     return TestClient(app)
 
 
-@pytest.fixture(autouse=True)
-def reset_activities():
-    """Reset activities data before each test"""
-    # Store original state
-    original_activities = {
-        "Tennis Club": {
-            "description": "Learn tennis skills and compete in matches",
-            "schedule": "Wednesdays and Saturdays, 4:00 PM - 5:30 PM",
-            "max_participants": 16,
-            "participants": ["alex@mergington.edu"]
-        },
-        "Basketball Team": {
-            "description": "Join our competitive basketball team",
-            "schedule": "Mondays and Thursdays, 3:30 PM - 5:00 PM",
-            "max_participants": 15,
-            "participants": ["james@mergington.edu", "marcus@mergington.edu"]
-        }
+# Baseline activity data, built once at import. Participants are tuples so
+# the pristine copy cannot be mutated by the app.
+_PRISTINE = {
+    "Tennis Club": {
+        "description": "Learn tennis skills and compete in matches",
+        "schedule": "Wednesdays and Saturdays, 4:00 PM - 5:30 PM",
+        "max_participants": 16,
+        "participants": ("alex@mergington.edu",)
+    },
+    "Basketball Team": {
+        "description": "Join our competitive basketball team",
+        "schedule": "Mondays and Thursdays, 3:30 PM - 5:00 PM",
+        "max_participants": 15,
+        "participants": ("james@mergington.edu", "marcus@mergington.edu")
     }
+}
 
-    # Clear and reset
-    activities.clear()
-    activities.update(original_activities)
 
-    yield
+def _build_activities():
+    """Copy the pristine activities with fresh, mutable participant lists"""
+    return {
+        name: {**activity, "participants": list(activity["participants"])}
+        for name, activity in _PRISTINE.items()
+    }
+
 
-    # Clean up after test
+def _reset():
+    """Restore the shared activities dict to the pristine baseline"""
     activities.clear()
-    activities.update(original_activities)
+    activities.update(_build_activities())
+
 
+@pytest.fixture(autouse=True, scope="function")
+def reset_activities():
+    """Reset activities data before each test"""
+    _reset()
+
+
+@pytest.fixture(scope="module")
+def baseline_activities_response(client):
+    """Fetch the baseline GET /activities payload once for read-only tests"""
+    # Module-scoped fixtures are set up before reset_activities and tests
+    # do not clean up after themselves, so seed the baseline explicitly
+    _reset()
+    response = client.get("/activities")
+    assert response.status_code == 200
+    return response.json()
 
+
+@pytest.mark.endpoint(name="root")
 class TestRootEndpoint:
     """Tests for the root endpoint"""
 
@@ -52,14 +83,14 @@ class TestRootEndpoint:
         assert response.headers["location"] == "/static/index.html"
 
 
+@pytest.mark.endpoint(name="activities")
 class TestGetActivities:
     """Tests for GET /activities endpoint"""
 
-    def test_get_activities_returns_all_activities(self, client):
+    def test_get_activities_returns_all_activities(
+            self, baseline_activities_response):
         """Test that GET /activities returns all activities"""
-        response = client.get("/activities")
-        assert response.status_code == 200
-        data = response.json()
+        data = baseline_activities_response
         assert "Tennis Club" in data
         assert "Basketball Team" in data
         assert isinstance(data["Tennis Club"], dict)
@@ -67,136 +98,120 @@ class TestGetActivities:
         assert "participants" in data["Tennis Club"]
         assert "max_participants" in data["Tennis Club"]
 
-    def test_activities_have_required_fields(self, client):
-        """Test that each activity has required fields"""
-        response = client.get("/activities")
-        data = response.json()
-
-        for activity_name, activity_data in data.items():
-            assert "description" in activity_data
-            assert "schedule" in activity_data
-            assert "max_participants" in activity_data
-            assert "participants" in activity_data
-            assert isinstance(activity_data["participants"], list)
-
-
-class TestSignupEndpoint:
-    """Tests for POST /activities/{activity_name}/signup endpoint"""
-
-    def test_signup_successful(self, client):
-        """Test successful signup for an activity"""
-        response = client.post(
-            "/activities/Tennis%20Club/signup?email=newstudent@mergington.edu"
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert "message" in data
-        assert "newstudent@mergington.edu" in data["message"]
-        assert "Tennis Club" in data["message"]
-
-        # Verify the participant was added
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "newstudent@mergington.edu" in activities_data["Tennis Club"]["participants"]
-
-    def test_signup_duplicate_participant(self, client):
-        """Test that duplicate signup is prevented"""
-        # First signup should succeed
-        response1 = client.post(
-            "/activities/Tennis%20Club/signup?email=test@mergington.edu"
-        )
-        assert response1.status_code == 200
-
-        # Second signup should fail
-        response2 = client.post(
-            "/activities/Tennis%20Club/signup?email=test@mergington.edu"
-        )
-        assert response2.status_code == 400
-        data = response2.json()
-        assert "already signed up" in data["detail"].lower()
-
-    def test_signup_nonexistent_activity(self, client):
-        """Test signup for a non-existent activity"""
-        response = client.post(
-            "/activities/Nonexistent%20Activity/signup?email=test@mergington.edu"
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert "Activity not found" in data["detail"]
-
-    def test_signup_increases_participant_count(self, client):
-        """Test that signup increases the participant count"""
-        # Get initial count
-        initial_response = client.get("/activities")
-        initial_participants = initial_response.json()["Tennis Club"]["participants"]
-        initial_count = len(initial_participants)
-
-        # Sign up a new student
-        client.post("/activities/Tennis%20Club/signup?email=new@mergington.edu")
-
-        # Verify count increased
-        updated_response = client.get("/activities")
-        updated_participants = updated_response.json()["Tennis Club"]["participants"]
-        updated_count = len(updated_participants)
-        assert updated_count == initial_count + 1
-
-
-class TestUnregisterEndpoint:
-    """Tests for DELETE /activities/{activity_name}/unregister endpoint"""
-
-    def test_unregister_successful(self, client):
-        """Test successful unregister from an activity"""
-        # First, sign up a student
-        client.post(
-            "/activities/Tennis%20Club/signup?email=temp@mergington.edu")
-
-        # Then unregister
-        response = client.delete(
-            "/activities/Tennis%20Club/unregister?email=temp@mergington.edu"
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert "message" in data
-        assert "Unregistered" in data["message"]
-        assert "temp@mergington.edu" in data["message"]
-
-        # Verify the participant was removed
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "temp@mergington.edu" not in activities_data["Tennis Club"]["participants"]
-
-    def test_unregister_not_signed_up(self, client):
-        """Test unregister for a student who isn't signed up"""
-        response = client.delete(
-            "/activities/Tennis%20Club/unregister?email=notsignedup@mergington.edu"
-        )
-        assert response.status_code == 400
-        data = response.json()
-        assert "not signed up" in data["detail"].lower()
-
-    def test_unregister_nonexistent_activity(self, client):
-        """Test unregister from a non-existent activity"""
-        response = client.delete(
-            "/activities/Nonexistent%20Activity/unregister?email=test@mergington.edu"
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert "Activity not found" in data["detail"]
-
-    def test_unregister_existing_participant(self, client):
-        """Test unregistering an existing participant"""
-        # Unregister alex@mergington.edu who is already in Tennis Club
-        response = client.delete(
-            "/activities/Tennis%20Club/unregister?email=alex@mergington.edu"
-        )
-        assert response.status_code == 200
-
-        # Verify the participant was removed
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "alex@mergington.edu" not in activities_data["Tennis Club"]["participants"]
-
-
+    @pytest.mark.parametrize("field,field_type", [
+        ("description", str),
+        ("schedule", str),
+        ("max_participants", int),
+        ("participants", list),
+    ])
+    def test_activities_have_required_fields(
+            self, baseline_activities_response, field, field_type):
+        """Test that each activity has the required field with the right type"""
+        for activity_data in baseline_activities_response.values():
+            assert isinstance(activity_data[field], field_type)
+
+
+# A signup/unregister scenario against Tennis Club, which starts with one
+# participant (alex). Actions are (method, endpoint, email local part)
+# tuples; the remaining fields describe the last response and final state.
+# The participant checked is the one named by the last action.
+Scenario = namedtuple(
+    "Scenario", ["actions", "status", "body_key", "body_has", "enrolled", "count"]
+)
+
+SCENARIOS = [
+    pytest.param(
+        Scenario(
+            actions=[("POST", "signup", "newstudent")],
+            status=200, body_key=b'"message"',
+            body_has=b"Signed up newstudent@mergington.edu for Tennis Club",
+            enrolled=True, count=2),
+        marks=pytest.mark.endpoint(name="signup"),
+        id="signup_ok"),
+    pytest.param(
+        Scenario(
+            actions=[("POST", "signup", "test")] * 2,
+            status=400, body_key=b'"detail"',
+            body_has=b"already signed up",
+            enrolled=True, count=2),
+        marks=pytest.mark.endpoint(name="signup"),
+        id="signup_duplicate"),
+    pytest.param(
+        Scenario(
+            actions=[("POST", "signup", "temp"),
+                     ("DELETE", "unregister", "temp")],
+            status=200, body_key=b'"message"',
+            body_has=b"Unregistered temp@mergington.edu from Tennis Club",
+            enrolled=False, count=1),
+        marks=[pytest.mark.endpoint(name="signup"),
+               pytest.mark.endpoint(name="unregister")],
+        id="unregister_ok"),
+    pytest.param(
+        Scenario(
+            actions=[("DELETE", "unregister", "alex")],
+            status=200, body_key=b'"message"',
+            body_has=b"Unregistered alex@mergington.edu from Tennis Club",
+            enrolled=False, count=0),
+        marks=pytest.mark.endpoint(name="unregister"),
+        id="unregister_existing"),
+    pytest.param(
+        Scenario(
+            actions=[("DELETE", "unregister", "notsignedup")],
+            status=400, body_key=b'"detail"',
+            body_has=b"not signed up",
+            enrolled=False, count=1),
+        marks=pytest.mark.endpoint(name="unregister"),
+        id="unregister_not_signed_up"),
+]
+
+
+class TestParticipantStateMachine:
+    """Tests for the signup/unregister participant state machine"""
+
+    @pytest.mark.parametrize("scenario", SCENARIOS)
+    def test_scenario(self, client, scenario):
+        """Test that a sequence of signup/unregister calls ends in the expected state"""
+        *setup, last = [
+            client.request(
+                method,
+                f"/activities/{TENNIS}/{endpoint}?email={local}@mergington.edu"
+            )
+            for method, endpoint, local in scenario.actions
+        ]
+        for response in setup:
+            assert response.status_code == 200
+
+        assert last.status_code == scenario.status
+        assert scenario.body_key in last.content
+        assert scenario.body_has in last.content
+
+        email = f"{scenario.actions[-1][2]}@mergington.edu"
+        participants = activities["Tennis Club"]["participants"]
+        assert (email in participants) is scenario.enrolled
+        assert len(participants) == scenario.count
+
+
+class TestNonexistentActivity:
+    """Tests for signup/unregister against an activity that does not exist"""
+
+    @pytest.mark.parametrize(
+        "handler", [
+            pytest.param(signup_for_activity,
+                         marks=pytest.mark.endpoint(name="signup")),
+            pytest.param(unregister_from_activity,
+                         marks=pytest.mark.endpoint(name="unregister")),
+        ]
+    )
+    def test_nonexistent_activity(self, handler):
+        """Test signup/unregister for a non-existent activity"""
+        with pytest.raises(HTTPException) as exc_info:
+            handler("Nonexistent Activity", "test@mergington.edu")
+        assert exc_info.value.status_code == 404
+        assert "Activity not found" in exc_info.value.detail
+
+
+@pytest.mark.endpoint(name="signup")
+@pytest.mark.endpoint(name="unregister")
 class TestIntegration:
     """Integration tests for complete workflows"""
 
@@ -206,31 +221,25 @@ class TestIntegration:
         activity = "Basketball Team"
 
         # Get initial state
-        initial_response = client.get("/activities")
-        initial_participants = initial_response.json()[
-            activity]["participants"]
+        initial_participants = list(activities[activity]["participants"])
         assert email not in initial_participants
 
         # Sign up
         signup_response = client.post(
-            f"/activities/{activity.replace(' ', '%20')}/signup?email={email}"
+            f"/activities/{BASKETBALL}/signup?email={email}"
         )
         assert signup_response.status_code == 200
 
         # Verify signup
-        after_signup_response = client.get("/activities")
-        after_signup_participants = after_signup_response.json()[
-            activity]["participants"]
-        assert email in after_signup_participants
+        assert email in activities[activity]["participants"]
 
         # Unregister
         unregister_response = client.delete(
-            f"/activities/{activity.replace(' ', '%20')}/unregister?email={email}"
+            f"/activities/{BASKETBALL}/unregister?email={email}"
         )
         assert unregister_response.status_code == 200
 
         # Verify unregister
-        final_response = client.get("/activities")
-        final_participants = final_response.json()[activity]["participants"]
+        final_participants = activities[activity]["participants"]
         assert email not in final_participants
         assert len(final_participants) == len(initial_participants)